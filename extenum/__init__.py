@@ -1,5 +1,7 @@
 from .constant_specific import ConstantSpecificEnum
-from .enumset import EnumSet
+from .enumgrid import EnumGrid
+from .enumset import EnumSet, FrozenEnumSet
 from .implicit_enum import ImplicitEnum
+from .large_enumset import LargeEnumSet
 
 __version__ = '0.8.1'
@@ -1,9 +1,13 @@
 from collections import defaultdict
 from enum import Enum, EnumMeta, _EnumDict
 from functools import update_wrapper
+from types import MethodType
+
+from .enumset import FrozenEnumSet
 
 __all__ = [
     'ConstantSpecificEnum',
+    'EnumIndex',
 ]
 
 _OVERLOAD_FACTORY_NAME = 'overload'
@@ -34,6 +38,29 @@ class _MethodRegister:
         return register
 
 
+class EnumIndex:
+
+    def __init__(self, enum_type, key):
+        self._enum_type = enum_type
+        self._key = key
+        self._index = None
+
+    def where(self, key):
+        if self._index is None:
+            self._index = self._build_index()
+        enumset = self._index.get(key)
+        if enumset is None:
+            return FrozenEnumSet(self._enum_type)
+        return enumset
+
+    def _build_index(self):
+        groups = {}
+        for const in self._enum_type:
+            groups.setdefault(self._key(const), []).append(const)
+        return {key: FrozenEnumSet(self._enum_type, constants)
+                for key, constants in groups.items()}
+
+
 class _EnumDefaultDict(_EnumDict, defaultdict):
 
     def __missing__(self, key):
@@ -72,8 +99,42 @@ class _ConstantSpecificMeta(EnumMeta):
         if wrapped_methods:
             metacls._validate_method_is_registered(enum_class, wrapped_methods)
 
+        if method_register is not None:
+            metacls._bind_overloaded_methods(enum_class, method_register)
+
         return enum_class
 
+    def index_by(cls, key, name=None):
+        if '_indexes' not in cls.__dict__:
+            cls._indexes = {}
+        cls._indexes[name] = index = EnumIndex(cls, key)
+        return index
+
+    def where(cls, key, index=None):
+        enum_index = cls.__dict__.get('_indexes', {}).get(index)
+        if enum_index is None:
+            if index is None:
+                raise ValueError('%r has no index' % cls)
+            raise ValueError('%r has no index %r' % (cls, index))
+        return enum_index.where(key)
+
+    @staticmethod
+    def _bind_overloaded_methods(enum_class, method_register):
+        for value, funcs in method_register.cache.items():
+            try:
+                const = enum_class(value)
+            except ValueError:
+                continue
+
+            for name, func in funcs.items():
+                wrapper = enum_class.__dict__.get(name)
+                if not hasattr(wrapper, '__wrapped__'):
+                    continue  # e.g. property, keep dispatching via wrapper
+                func.__qualname__ = '%s.%s.%s' % (
+                    enum_class.__qualname__, name, const._name_)
+                setattr(wrapper, const._name_, func)
+                const.__dict__[name] = MethodType(func, const)
+
     @staticmethod
     def _validate_method_is_registered(enum_class, wrapped_methods):
         def validate(wrapped_methods, method_register):
@@ -0,0 +1,117 @@
+from enum import Enum
+from itertools import product
+
+from .enumset import _member_ordinals, _members
+
+__all__ = [
+    'EnumGrid',
+]
+
+
+class EnumGrid:
+
+    def __init__(self, *enum_types, default=None):
+        if not enum_types:
+            raise ValueError('at least one Enum type is required')
+        for enum_type in enum_types:
+            if not issubclass(enum_type, Enum):
+                raise TypeError('%r is not Enum subclass' % enum_type)
+
+        self._enum_types = enum_types
+        self._ordinals = tuple(map(_member_ordinals, enum_types))
+        self._strides = []
+        size = 1
+        for enum_type in reversed(enum_types):
+            self._strides.insert(0, size)
+            size *= len(_members(enum_type))
+        self._values = [default] * size
+
+    def __repr__(self):
+        enum_types = ', '.join(map(repr, self._enum_types))
+        return '%s(%s)' % (self.__class__.__name__, enum_types)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, key):
+        return self._values[self._index(key)]
+
+    def __setitem__(self, key, value):
+        self._values[self._index(key)] = value
+
+    def pack(self, *constants):
+        if len(constants) != len(self._enum_types):
+            msg = '%r does not match %r' % (constants, self._enum_types)
+            raise ValueError(msg)
+
+        key = 0
+        for const, ordinals, stride, enum_type in zip(
+                constants, self._ordinals, self._strides, self._enum_types):
+            # IntEnum members of another Enum are equal to the ones of this
+            if not isinstance(const, enum_type):
+                msg = '%r is not member of %r' % (const, enum_type)
+                raise ValueError(msg)
+            key += ordinals[const] * stride
+        return key
+
+    def unpack(self, key):
+        if not 0 <= key < len(self._values):
+            raise IndexError('%r is out of range' % key)
+
+        constants = []
+        for enum_type, stride in zip(self._enum_types, self._strides):
+            ordinal, key = divmod(key, stride)
+            constants.append(_members(enum_type)[ordinal])
+        return tuple(constants)
+
+    def fill(self, value, *selections):
+        if not selections:
+            selections = (None,) * len(self._enum_types)
+        if len(selections) != len(self._enum_types):
+            msg = '%r does not match %r' % (selections, self._enum_types)
+            raise ValueError(msg)
+
+        *heads, last = map(self._offsets, range(len(selections)), selections)
+        if last is None:
+            width = len(_members(self._enum_types[-1]))
+            values = [value] * width
+            for offsets in product(*heads):
+                base = sum(offsets)
+                self._values[base:base + width] = values
+        else:
+            for offsets in product(*heads, last):
+                self._values[sum(offsets)] = value
+
+    def items(self):
+        for key, value in enumerate(self._values):
+            yield self.unpack(key), value
+
+    def _offsets(self, dimension, selection):
+        # selection is None for all members, a member or an iterable of them
+        enum_type = self._enum_types[dimension]
+        stride = self._strides[dimension]
+        if selection is None:
+            if dimension == len(self._enum_types) - 1:
+                return None
+            return range(0, len(_members(enum_type)) * stride, stride)
+
+        if isinstance(selection, Enum):
+            selection = (selection,)
+        offsets = []
+        ordinals = self._ordinals[dimension]
+        for const in selection:
+            if not isinstance(const, enum_type):
+                msg = '%r is not member of %r' % (const, enum_type)
+                raise ValueError(msg)
+            offsets.append(ordinals[const] * stride)
+        return offsets
+
+    def _index(self, key):
+        # IntEnum members are int as well, only a plain int is a packed key
+        if type(key) is not int:
+            if isinstance(key, tuple):
+                return self.pack(*key)
+            return self.pack(key)
+        if not 0 <= key < len(self._values):
+            raise IndexError('%r is out of range' % key)
+        return key
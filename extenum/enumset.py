@@ -4,6 +4,7 @@ from operator import le
 
 __all__ = [
     'EnumSet',
+    'FrozenEnumSet',
 ]
 
 
@@ -12,6 +13,72 @@ class EnumTypeMode(Enum):
     ALL = 2
 
 
+def _members(enum_type):
+    # cache on the Enum class so that it can be garbage-collected
+    members = enum_type.__dict__.get('_extenum_members')
+    if members is None:
+        members = tuple(enum_type)
+        enum_type._extenum_members = members
+    return members
+
+
+def _member_ordinals(enum_type):
+    ordinals = enum_type.__dict__.get('_extenum_ordinals')
+    if ordinals is None:
+        ordinals = {const: i for i, const in enumerate(_members(enum_type))}
+        enum_type._extenum_ordinals = ordinals
+    return ordinals
+
+
+def _mask_of(enum_type, constants):
+    ordinals = _member_ordinals(enum_type)
+    mask = 0
+    for const in constants:
+        mask |= 1 << ordinals[const]
+    return mask
+
+
+class EnumSetPredicate:
+
+    __slots__ = ('_enum_type', '_requires', '_care', '_any_of')
+
+    def __init__(self, enum_type, requires, forbids, any_of):
+        self._enum_type = enum_type
+        self._requires = requires
+        # requires and forbids are checked at once: the bits of both must
+        # equal the bits of requires, which never holds if they overlap
+        self._care = requires | forbids
+        self._any_of = any_of
+
+    def __call__(self, target):
+        # bool and IntEnum members are int as well, they are not a raw mask
+        if type(target) is not int:
+            if getattr(target, '_enum_type', None) is not self._enum_type:
+                msg = '%r is not EnumSet of %r' % (target, self._enum_type)
+                raise ValueError(msg)
+            target = target.mask()
+        any_of = self._any_of
+        return (target & self._care == self._requires and
+                (not any_of or target & any_of != 0))
+
+    def evaluate_all(self, targets):
+        care, requires, any_of = self._care, self._requires, self._any_of
+        mask_of = self._mask_of
+        results = []
+        for target in targets:
+            if type(target) is not int:
+                target = mask_of(target)
+            results.append(target & care == requires and
+                           (not any_of or target & any_of != 0))
+        return results
+
+    def _mask_of(self, enumset):
+        if getattr(enumset, '_enum_type', None) is not self._enum_type:
+            msg = '%r is not EnumSet of %r' % (enumset, self._enum_type)
+            raise ValueError(msg)
+        return enumset.mask()
+
+
 class EnumSetMeta(type):
 
     def none_of(cls, enum_type):
@@ -42,6 +109,16 @@ class EnumSetMeta(type):
         enumset.update(range_set)
         return enumset
 
+    def predicate(cls, requires=(), forbids=(), any_of=()):
+        requires, forbids, any_of = map(tuple, (requires, forbids, any_of))
+        enum_type = cls._get_enum_type(requires + forbids + any_of)
+        masks = []
+        for constants in (requires, forbids, any_of):
+            enumset = cls._create_enum_set(enum_type, EnumTypeMode.NONE)
+            enumset.update(constants)
+            masks.append(enumset.mask())
+        return EnumSetPredicate(enum_type, *masks)
+
     def _create_enum_set(cls, enum_type, mode):
         enumset = cls.__new__(cls, enum_type)
         if mode is EnumTypeMode.ALL:
@@ -63,21 +140,178 @@ class EnumSet(set, metaclass=EnumSetMeta):
 
         enumset = super().__new__(cls)
         enumset._enum_type = enum_type
+        enumset._mask = 0  # kept up to date by every mutating method
         return enumset
 
     def __init__(self, enum_type):
         super().__init__(self)
 
+    def __iand__(self, other):
+        result = super().__iand__(other)
+        self._reset_mask()
+        return result
+
+    def __ior__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        result = super().__isub__(other)
+        self._reset_mask()
+        return result
+
+    def __ixor__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
     def add(self, elem):
         self._validate(elem)
         super().add(elem)
+        self._mask |= 1 << _member_ordinals(self._enum_type)[elem]
+
+    def discard(self, elem):
+        size = len(self)
+        super().discard(elem)
+        if len(self) != size:
+            self._unset_mask(elem)
+
+    def remove(self, elem):
+        super().remove(elem)
+        self._unset_mask(elem)
+
+    def pop(self):
+        elem = super().pop()
+        self._unset_mask(elem)
+        return elem
+
+    def clear(self):
+        super().clear()
+        self._mask = 0
 
     def update(self, *others):
         for other in others:
             for elem in other:
                 self.add(elem)
 
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self._reset_mask()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self._reset_mask()
+
+    def symmetric_difference_update(self, other):
+        other = tuple(other)
+        for elem in other:
+            self._validate(elem)
+        super().symmetric_difference_update(other)
+        self._reset_mask()
+
+    def mask(self):
+        return self._mask
+
+    def checkpoint(self):
+        self._checkpoint = frozenset(self)
+
+    def changes(self):
+        checkpoint = getattr(self, '_checkpoint', None)
+        if checkpoint is None:
+            raise ValueError('%r has no checkpoint' % self)
+        return self._split_diff(checkpoint, self)
+
+    def diff(self, other):
+        self._validate_enum_set(other)
+        return self._split_diff(self, other)
+
+    def apply_diff(self, added, removed):
+        self._validate_enum_set(added)
+        self._validate_enum_set(removed)
+        self.difference_update(removed)
+        self.update(added)
+
+    def _split_diff(self, before, after):
+        added = self.__class__(self._enum_type)
+        removed = self.__class__(self._enum_type)
+        for elem in before ^ after:
+            if elem in after:
+                added.add(elem)
+            else:
+                removed.add(elem)
+        return added, removed
+
+    def _validate_enum_set(self, other):
+        if getattr(other, '_enum_type', None) is not self._enum_type:
+            msg = '%r is not EnumSet of %r' % (other, self._enum_type)
+            raise ValueError(msg)
+
+    def _reset_mask(self):
+        self._mask = _mask_of(self._enum_type, self)
+
+    def _unset_mask(self, elem):
+        if isinstance(elem, self._enum_type):
+            self._mask &= ~(1 << _member_ordinals(self._enum_type)[elem])
+        else:  # an equal value of another type, e.g. an int for IntEnum
+            self._reset_mask()
+
     def _validate(self, elem):
         if not isinstance(elem, self._enum_type):
             msg = '%r is not member of %r' % (elem, self._enum_type)
             raise ValueError(msg)
+
+
+class FrozenEnumSet(frozenset):
+
+    def __new__(cls, enum_type, constants=()):
+        if not issubclass(enum_type, Enum):
+            raise TypeError('%r is not Enum subclass' % enum_type)
+
+        constants = tuple(constants)
+        for const in constants:
+            if not isinstance(const, enum_type):
+                msg = '%r is not member of %r' % (const, enum_type)
+                raise ValueError(msg)
+
+        enumset = super().__new__(cls, constants)
+        enumset._enum_type = enum_type
+        enumset._mask = _mask_of(enum_type, enumset)
+        return enumset
+
+    def __and__(self, other):
+        return self._wrap(super().__and__(other))
+
+    def __or__(self, other):
+        return self._wrap(super().__or__(other))
+
+    def __sub__(self, other):
+        return self._wrap(super().__sub__(other))
+
+    def __xor__(self, other):
+        return self._wrap(super().__xor__(other))
+
+    def copy(self):
+        return self
+
+    def union(self, *others):
+        return self._wrap(super().union(*others))
+
+    def intersection(self, *others):
+        return self._wrap(super().intersection(*others))
+
+    def difference(self, *others):
+        return self._wrap(super().difference(*others))
+
+    def symmetric_difference(self, other):
+        return self._wrap(super().symmetric_difference(other))
+
+    def mask(self):
+        return self._mask
+
+    def _wrap(self, result):
+        if result is NotImplemented:
+            return result
+        return self.__class__(self._enum_type, result)
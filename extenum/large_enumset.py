@@ -0,0 +1,574 @@
+from abc import ABCMeta
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import MutableSet
+from enum import Enum
+from operator import and_, or_, xor
+
+from .enumset import EnumSetMeta, _member_ordinals, _members
+
+__all__ = [
+    'LargeEnumSet',
+]
+
+
+class ContainerType(Enum):
+    ARRAY = 1
+    BITMAP = 2
+    RUN = 3
+
+
+class _Container:
+
+    # data is a sorted array of positions for ARRAY, a bytearray for BITMAP
+    # and a flat array of (start, last) pairs for RUN
+    __slots__ = ('type', 'data', 'card')
+
+    def __init__(self, type_, data, card):
+        self.type = type_
+        self.data = data
+        self.card = card
+
+    def copy(self):
+        return _Container(self.type, self.data[:], self.card)
+
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(bits):
+        return bin(bits).count('1')
+
+
+def _positions(buf):
+    for i, byte in enumerate(buf):
+        while byte:
+            low = byte & -byte
+            yield (i << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def _bitmap_of(positions, chunk_size):
+    buf = bytearray(chunk_size >> 3)
+    for low in positions:
+        buf[low >> 3] |= 1 << (low & 7)
+    return buf
+
+
+def _to_bitmap(container, chunk_size):
+    type_, data = container.type, container.data
+    if type_ is ContainerType.BITMAP:
+        return int.from_bytes(data, 'little')
+    if type_ is ContainerType.ARRAY:
+        return int.from_bytes(_bitmap_of(data, chunk_size), 'little')
+
+    bits = 0
+    for i in range(0, len(data), 2):
+        start, last = data[i], data[i + 1]
+        bits |= ((1 << (last - start + 1)) - 1) << start
+    return bits
+
+
+def _from_bitmap(bits, chunk_size):
+    if not bits:
+        return None
+
+    # compare the size in bytes of each container type
+    nbytes = chunk_size >> 3
+    card = _popcount(bits)
+    starts = bits & ~(bits << 1)
+    runs = _popcount(starts)
+    if 4 * runs < min(2 * card, nbytes):
+        ends = bits & ~(bits >> 1)
+        data = array('H')
+        for start, last in zip(_positions(starts.to_bytes(nbytes, 'little')),
+                               _positions(ends.to_bytes(nbytes, 'little'))):
+            data.extend((start, last))
+        return _Container(ContainerType.RUN, data, card)
+
+    buf = bits.to_bytes(nbytes, 'little')
+    if 2 * card <= nbytes:
+        data = array('H', _positions(buf))
+        return _Container(ContainerType.ARRAY, data, card)
+    return _Container(ContainerType.BITMAP, bytearray(buf), card)
+
+
+def _from_runs(runs, card, positions, chunk_size):
+    # positions iterates over the same members as runs and is only consumed
+    # when the container is not RUN
+    if not card:
+        return None
+
+    nbytes = chunk_size >> 3
+    if 2 * len(runs) < min(2 * card, nbytes):
+        return _Container(ContainerType.RUN, runs, card)
+    if 2 * card <= nbytes:
+        return _Container(ContainerType.ARRAY, array('H', positions), card)
+    data = _bitmap_of(positions, chunk_size)
+    return _Container(ContainerType.BITMAP, data, card)
+
+
+def _from_positions(positions, chunk_size):
+    # positions is a sorted sequence
+    return _from_runs(_runs_of(positions), len(positions), positions,
+                      chunk_size)
+
+
+def _runs_of(positions):
+    runs = array('H')
+    for low in positions:
+        if runs and runs[-1] == low - 1:
+            runs[-1] = low
+        else:
+            runs.extend((low, low))
+    return runs
+
+
+def _contains(container, low):
+    type_, data = container.type, container.data
+    if type_ is ContainerType.BITMAP:
+        return bool(data[low >> 3] >> (low & 7) & 1)
+
+    i = bisect_left(data, low)
+    if type_ is ContainerType.ARRAY:
+        return i < len(data) and data[i] == low
+    return i % 2 == 1 or (i < len(data) and data[i] == low)
+
+
+def _iter(container):
+    type_, data = container.type, container.data
+    if type_ is ContainerType.ARRAY:
+        return iter(data)
+    if type_ is ContainerType.BITMAP:
+        return _positions(data)
+    return _iter_runs(data)
+
+
+def _sub(bits, other):
+    return bits & ~other
+
+
+def _merge_runs(runs, other, op):
+    # sweep the boundaries of [start, last + 1) of both and keep the points
+    # where op of being inside each of them holds
+    bounds = [low + i % 2 for i, low in enumerate(runs)]
+    other_bounds = [low + i % 2 for i, low in enumerate(other)]
+    merged = array('H')
+    card = 0
+    start = None
+    for point in sorted(set(bounds).union(other_bounds)):
+        inside = op(bisect_right(bounds, point) & 1,
+                    bisect_right(other_bounds, point) & 1)
+        if inside and start is None:
+            start = point
+        elif not inside and start is not None:
+            merged.extend((start, point - 1))
+            card += point - start
+            start = None
+    return merged, card
+
+
+def _merge(container, other, op, chunk_size):
+    # a bitmap is built only when one of them is already a bitmap
+    if op is and_ and other.type is ContainerType.ARRAY:
+        container, other = other, container
+    if container.type is ContainerType.ARRAY and op in (and_, _sub):
+        keep = op is and_
+        positions = [low for low in container.data
+                     if _contains(other, low) is keep]
+        return _from_positions(positions, chunk_size)
+
+    types = (container.type, other.type)
+    if ContainerType.BITMAP in types:
+        bits = op(_to_bitmap(container, chunk_size),
+                  _to_bitmap(other, chunk_size))
+        return _from_bitmap(bits, chunk_size)
+    if types == (ContainerType.ARRAY, ContainerType.ARRAY):
+        positions = sorted(op(set(container.data), set(other.data)))
+        return _from_positions(positions, chunk_size)
+
+    runs, card = _merge_runs(_runs(container), _runs(other), op)
+    return _from_runs(runs, card, _iter_runs(runs), chunk_size)
+
+
+def _runs(container):
+    if container.type is ContainerType.RUN:
+        return container.data
+    return _runs_of(container.data)
+
+
+def _iter_runs(runs):
+    for i in range(0, len(runs), 2):
+        yield from range(runs[i], runs[i + 1] + 1)
+
+
+def _run_container(container, chunk_size):
+    if 2 * len(container.data) < min(2 * container.card, chunk_size >> 3):
+        return container
+    return _from_bitmap(_to_bitmap(container, chunk_size), chunk_size)
+
+
+# _add and _discard update the container in place and return the container
+# to store, which is another one when the container type changes
+
+def _add(container, low, chunk_size):
+    type_, data = container.type, container.data
+    if type_ is ContainerType.BITMAP:
+        data[low >> 3] |= 1 << (low & 7)
+        container.card += 1
+        return container
+    if type_ is ContainerType.ARRAY:
+        if 2 * (container.card + 1) > chunk_size >> 3:
+            bits = _to_bitmap(container, chunk_size) | 1 << low
+            return _from_bitmap(bits, chunk_size)
+        data.insert(bisect_left(data, low), low)
+        container.card += 1
+        return container
+
+    # low is between the last of the previous run and the start of the next
+    i = bisect_left(data, low)
+    joins_prev = i > 0 and data[i - 1] == low - 1
+    joins_next = i < len(data) and data[i] == low + 1
+    if joins_prev and joins_next:
+        del data[i - 1:i + 1]
+    elif joins_prev:
+        data[i - 1] = low
+    elif joins_next:
+        data[i] = low
+    else:
+        data[i:i] = array('H', (low, low))
+    container.card += 1
+    return _run_container(container, chunk_size)
+
+
+def _discard(container, low, chunk_size):
+    type_, data = container.type, container.data
+    if container.card == 1:
+        return None
+    container.card -= 1
+    if type_ is ContainerType.ARRAY:
+        del data[bisect_left(data, low)]
+        return container
+    if type_ is ContainerType.BITMAP:
+        data[low >> 3] &= ~(1 << (low & 7))
+        if 2 * container.card <= chunk_size >> 3:
+            return _from_bitmap(_to_bitmap(container, chunk_size), chunk_size)
+        return container
+
+    i = bisect_left(data, low) // 2 * 2
+    start, last = data[i], data[i + 1]
+    if start == last:
+        del data[i:i + 2]
+    elif low == start:
+        data[i] = low + 1
+    elif low == last:
+        data[i + 1] = low - 1
+    else:
+        data[i + 1:i + 1] = array('H', (low - 1, low + 1))
+    return _run_container(container, chunk_size)
+
+
+class LargeEnumSetMeta(EnumSetMeta, ABCMeta):
+    pass
+
+
+class LargeEnumSet(MutableSet, metaclass=LargeEnumSetMeta):
+
+    _chunk_bits = 16
+
+    def __new__(cls, enum_type):
+        if not issubclass(enum_type, Enum):
+            raise TypeError('%r is not Enum subclass' % enum_type)
+
+        enumset = super().__new__(cls)
+        enumset._enum_type = enum_type
+        enumset._chunks = {}
+        enumset._shared = set()  # keys of chunks shared with a copy
+        return enumset
+
+    def __repr__(self):
+        if not self._chunks:
+            return '%s()' % self.__class__.__name__
+        members = ', '.join(map(repr, self))
+        return '%s({%s})' % (self.__class__.__name__, members)
+
+    def __contains__(self, elem):
+        ordinal = _member_ordinals(self._enum_type).get(elem)
+        if ordinal is None:
+            return False
+        container = self._chunks.get(ordinal >> self._chunk_bits)
+        if container is None:
+            return False
+        return _contains(container, self._low(ordinal))
+
+    def __iter__(self):
+        members = _members(self._enum_type)
+        for key in sorted(self._chunks):
+            base = key << self._chunk_bits
+            for low in _iter(self._chunks[key]):
+                yield members[base + low]
+
+    def __len__(self):
+        return sum(container.card for container in self._chunks.values())
+
+    def __eq__(self, other):
+        if not self._is_compatible(other):
+            return super().__eq__(other)
+        return (self._chunks.keys() == other._chunks.keys() and
+                all(self._bitmap(key) == other._bitmap(key)
+                    for key in self._chunks))
+
+    def __le__(self, other):
+        if not self._is_compatible(other):
+            return super().__le__(other)
+        for key in self._chunks:
+            bits = self._bitmap(key)
+            if bits & other._bitmap(key) != bits:
+                return False
+        return True
+
+    def __and__(self, other):
+        if not self._is_compatible(other):
+            return super().__and__(other)
+        keys = self._chunks.keys() & other._chunks.keys()
+        return self._combine(other, and_, keys)
+
+    def __or__(self, other):
+        if not self._is_compatible(other):
+            return super().__or__(other)
+        keys = self._chunks.keys() | other._chunks.keys()
+        return self._combine(other, or_, keys)
+
+    def __sub__(self, other):
+        if not self._is_compatible(other):
+            return super().__sub__(other)
+        return self._combine(other, _sub, self._chunks.keys())
+
+    def __xor__(self, other):
+        if not self._is_compatible(other):
+            return super().__xor__(other)
+        keys = self._chunks.keys() | other._chunks.keys()
+        return self._combine(other, xor, keys)
+
+    def __iand__(self, other):
+        if not self._is_compatible(other):
+            return super().__iand__(other)
+        self._replace(self & other)
+        return self
+
+    def __ior__(self, other):
+        if not self._is_compatible(other):
+            return super().__ior__(other)
+        self._replace(self | other)
+        return self
+
+    def __isub__(self, other):
+        if not self._is_compatible(other):
+            return super().__isub__(other)
+        self._replace(self - other)
+        return self
+
+    def __ixor__(self, other):
+        if not self._is_compatible(other):
+            return super().__ixor__(other)
+        self._replace(self ^ other)
+        return self
+
+    def add(self, elem):
+        self._validate(elem)
+        ordinal = _member_ordinals(self._enum_type)[elem]
+        key, low = ordinal >> self._chunk_bits, self._low(ordinal)
+        container = self._chunks.get(key)
+        if container is None:
+            data = array('H', (low,))
+            self._chunks[key] = _Container(ContainerType.ARRAY, data, 1)
+        elif not _contains(container, low):
+            container = _add(self._writable(key), low, 1 << self._chunk_bits)
+            self._store(key, container)
+
+    def discard(self, elem):
+        ordinal = _member_ordinals(self._enum_type).get(elem)
+        if ordinal is None:
+            return
+        key, low = ordinal >> self._chunk_bits, self._low(ordinal)
+        container = self._chunks.get(key)
+        if container is None or not _contains(container, low):
+            return
+
+        container = _discard(self._writable(key), low, 1 << self._chunk_bits)
+        self._store(key, container)
+
+    def clear(self):
+        self._replace(self.__class__(self._enum_type))
+
+    def copy(self):
+        enumset = self.__class__(self._enum_type)
+        enumset._chunks = dict(self._chunks)
+        enumset._shared = set(self._chunks)
+        self._shared = set(self._chunks)
+        return enumset
+
+    def update(self, *others):
+        ordinals = _member_ordinals(self._enum_type)
+        chunk_size = 1 << self._chunk_bits
+        for other in others:
+            if self._is_compatible(other):
+                self |= other
+                continue
+
+            # existing containers are updated in place, new ones are built
+            # at once to choose the container type
+            created = {}
+            try:
+                for elem in other:
+                    self._validate(elem)
+                    ordinal = ordinals[elem]
+                    key, low = ordinal >> self._chunk_bits, self._low(ordinal)
+                    container = self._chunks.get(key)
+                    if container is None:
+                        created.setdefault(key, set()).add(low)
+                    elif not _contains(container, low):
+                        container = _add(self._writable(key), low, chunk_size)
+                        self._store(key, container)
+            finally:
+                for key, lows in created.items():
+                    self._chunks[key] = _from_positions(sorted(lows),
+                                                        chunk_size)
+
+    def union(self, *others):
+        enumset = self.copy()
+        enumset.update(*others)
+        return enumset
+
+    def intersection(self, *others):
+        enumset = self.copy()
+        enumset.intersection_update(*others)
+        return enumset
+
+    def difference(self, *others):
+        enumset = self.copy()
+        enumset.difference_update(*others)
+        return enumset
+
+    def symmetric_difference(self, other):
+        enumset = self.copy()
+        enumset.symmetric_difference_update(other)
+        return enumset
+
+    def intersection_update(self, *others):
+        for other in others:
+            self &= self._members_of(other)
+
+    def difference_update(self, *others):
+        for other in others:
+            self -= self._members_of(other)
+
+    def symmetric_difference_update(self, other):
+        if not self._is_compatible(other):
+            other = self._from_iterable(other)
+        self ^= other
+
+    def issubset(self, other):
+        return self <= self._members_of(other)
+
+    def issuperset(self, other):
+        if self._is_compatible(other):
+            return other <= self
+        return all(elem in self for elem in other)
+
+    def mask(self):
+        mask = 0
+        for key in self._chunks:
+            mask |= self._bitmap(key) << (key << self._chunk_bits)
+        return mask
+
+    def checkpoint(self):
+        self._checkpoint = self.copy()
+
+    def changes(self):
+        checkpoint = getattr(self, '_checkpoint', None)
+        if checkpoint is None:
+            raise ValueError('%r has no checkpoint' % self)
+        return checkpoint.diff(self)
+
+    def diff(self, other):
+        self._validate_enum_set(other)
+        return other - self, self - other
+
+    def apply_diff(self, added, removed):
+        self._validate_enum_set(added)
+        self._validate_enum_set(removed)
+        self -= removed
+        self |= added
+
+    def _from_iterable(self, it):
+        enumset = self.__class__(self._enum_type)
+        enumset.update(it)
+        return enumset
+
+    def _members_of(self, other):
+        if self._is_compatible(other):
+            return other
+        return self._from_iterable(
+            elem for elem in other if isinstance(elem, self._enum_type))
+
+    def _combine(self, other, op, keys):
+        enumset = self.__class__(self._enum_type)
+        chunk_size = 1 << self._chunk_bits
+        for key in keys:
+            container = self._chunks.get(key)
+            other_container = other._chunks.get(key)
+            if container is None or other_container is None:
+                # only or, xor and sub get here, the result is the other one
+                source = other if container is None else self
+                enumset._chunks[key] = source._chunks[key]
+                enumset._shared.add(key)
+                source._shared.add(key)
+                continue
+
+            container = _merge(container, other_container, op, chunk_size)
+            if container is not None:
+                enumset._chunks[key] = container
+        return enumset
+
+    def _writable(self, key):
+        container = self._chunks[key]
+        if key in self._shared:
+            container = self._chunks[key] = container.copy()
+            self._shared.discard(key)
+        return container
+
+    def _store(self, key, container):
+        if container is None:
+            del self._chunks[key]
+        else:
+            self._chunks[key] = container
+        self._shared.discard(key)
+
+    def _replace(self, enumset):
+        self._chunks = enumset._chunks
+        self._shared = enumset._shared
+
+    def _bitmap(self, key):
+        container = self._chunks.get(key)
+        if container is None:
+            return 0
+        return _to_bitmap(container, 1 << self._chunk_bits)
+
+    def _low(self, ordinal):
+        return ordinal & ((1 << self._chunk_bits) - 1)
+
+    def _is_compatible(self, other):
+        return (isinstance(other, LargeEnumSet) and
+                other._enum_type is self._enum_type and
+                other._chunk_bits == self._chunk_bits)
+
+    def _validate_enum_set(self, other):
+        if not self._is_compatible(other):
+            msg = '%r is not LargeEnumSet of %r' % (other, self._enum_type)
+            raise ValueError(msg)
+
+    def _validate(self, elem):
+        if not isinstance(elem, self._enum_type):
+            msg = '%r is not member of %r' % (elem, self._enum_type)
+            raise ValueError(msg)
@@ -1,7 +1,21 @@
+import pickle
 from operator import methodcaller
 
 import pytest
-from extenum import ConstantSpecificEnum
+from extenum import ConstantSpecificEnum, EnumSet, FrozenEnumSet
+
+
+class Operation(ConstantSpecificEnum):
+    PLUS = '+'
+    MINUS = '-'
+
+    @overload(PLUS)
+    def apply(self, x, y):
+        return x + y
+
+    @overload(MINUS)
+    def apply(self, x, y):
+        return x - y
 
 
 def test_constant_specific_method():
@@ -202,3 +216,85 @@ def test_work_as_planet_constant_specific_enum():
     assert Planet.EARTH.surface_gravity == 9.802652743337129
     for name, const in Planet.__members__.items():
         assert name == const.name()
+
+
+def test_where_by_index():
+    class Day(ConstantSpecificEnum):
+        MONDAY = (1, 'weekday')
+        TUESDAY = (2, 'weekday')
+        WEDNESDAY = (3, 'weekday')
+        THURSDAY = (4, 'weekday')
+        FRIDAY = (5, 'weekday')
+        SATURDAY = (6, 'weekend')
+        SUNDAY = (7, 'weekend')
+
+        def __init__(self, number, kind):
+            self.number = number
+            self.kind = kind
+
+    Day.index_by(lambda const: const.kind)
+    weekend = Day.where('weekend')
+    assert weekend == {Day.SATURDAY, Day.SUNDAY}
+    assert weekend._enum_type is Day
+    assert len(Day.where('weekday')) == 5
+    assert Day.where('weekday') is Day.where('weekday')
+    assert len(Day.where('holiday')) == 0
+
+    with pytest.raises(AttributeError):
+        weekend.add(Day.MONDAY)
+    weekend |= {Day.MONDAY}
+    assert Day.where('weekend') == {Day.SATURDAY, Day.SUNDAY}
+    assert isinstance(Day.where('weekend'), FrozenEnumSet)
+
+    even = Day.index_by(lambda const: const.number % 2 == 0, name='even')
+    assert even.where(True) == {Day.TUESDAY, Day.THURSDAY, Day.SATURDAY}
+    assert Day.where(True, index='even') == even.where(True)
+    assert Day.where('weekend') == {Day.SATURDAY, Day.SUNDAY}
+
+    even_weekend = Day.where('weekend') & even.where(True)
+    assert even_weekend == {Day.SATURDAY}
+    assert isinstance(even_weekend, FrozenEnumSet)
+    assert even_weekend._enum_type is Day
+    assert even_weekend.mask() == 0b100000
+    added, removed = EnumSet.of(Day.SATURDAY).diff(
+        Day.where('weekend') | even.where(True))
+    assert added == {Day.TUESDAY, Day.THURSDAY, Day.SUNDAY}
+    assert len(removed) == 0
+
+
+def test_raise_where_without_index():
+    class TestEnum(ConstantSpecificEnum):
+        ONE = 1
+
+    with pytest.raises(ValueError) as excinfo:
+        TestEnum.where(1)
+
+    expected = "<enum 'TestEnum'> has no index"
+    assert str(excinfo.value) == expected
+
+    TestEnum.index_by(lambda const: const.value)
+    with pytest.raises(ValueError) as excinfo:
+        TestEnum.where(1, index='other')
+
+    expected = "<enum 'TestEnum'> has no index 'other'"
+    assert str(excinfo.value) == expected
+
+
+def test_overloaded_method_is_bound_to_constant():
+    assert Operation.PLUS.apply.__func__ is Operation.apply.PLUS
+    assert Operation.MINUS.apply.__func__ is Operation.apply.MINUS
+    assert Operation.apply.PLUS.__qualname__ == 'Operation.apply.PLUS'
+    assert Operation.PLUS.apply(2, 4) == 6
+    assert Operation.MINUS.apply(2, 4) == -2
+    assert Operation.apply(Operation.MINUS, 2, 4) == -2
+
+
+def test_pickle_overloaded_method():
+    for const in Operation:
+        method = pickle.loads(pickle.dumps(const.apply))
+        assert method.__self__ is const
+        assert method(2, 4) == const.apply(2, 4)
+
+    func = pickle.loads(pickle.dumps(Operation.apply.PLUS))
+    assert func is Operation.apply.PLUS
+    assert func(Operation.PLUS, 2, 4) == 6
@@ -0,0 +1,184 @@
+from enum import Enum, IntEnum
+
+import pytest
+from extenum import EnumGrid, EnumSet
+
+
+class Region(Enum):
+    US = 1
+    EU = 2
+    ASIA = 3
+
+
+class Tier(Enum):
+    FREE = 1
+    PRO = 2
+
+
+class PayType(Enum):
+    WEEKDAY = 1
+    WEEKEND = 2
+
+
+def test_enumgrid_get_and_set():
+    grid = EnumGrid(Region, Tier, PayType, default=0)
+    assert len(grid) == 12
+    assert repr(grid) == "EnumGrid(<enum 'Region'>, <enum 'Tier'>, " \
+                         "<enum 'PayType'>)"
+    assert grid[Region.EU, Tier.PRO, PayType.WEEKEND] == 0
+
+    grid[Region.EU, Tier.PRO, PayType.WEEKEND] = 100
+    assert grid[Region.EU, Tier.PRO, PayType.WEEKEND] == 100
+    assert grid[Region.EU, Tier.PRO, PayType.WEEKDAY] == 0
+
+    key = grid.pack(Region.EU, Tier.PRO, PayType.WEEKEND)
+    assert key == 7
+    assert grid[key] == 100
+    grid[key] = 200
+    assert grid[Region.EU, Tier.PRO, PayType.WEEKEND] == 200
+
+
+def test_enumgrid_int_enum_dimension():
+    class Level(IntEnum):
+        LOW = 10
+        HIGH = 0
+
+    grid = EnumGrid(Level, Tier)
+    grid[Level.LOW, Tier.PRO] = 'low pro'
+    assert grid[Level.LOW, Tier.PRO] == 'low pro'
+    assert grid[Level.HIGH, Tier.FREE] is None
+    assert grid[1] == 'low pro'
+
+    level_grid = EnumGrid(Level)
+    level_grid[Level.LOW] = 'low'
+    level_grid[Level.HIGH] = 'high'
+    assert level_grid[Level.LOW] == 'low'
+    assert level_grid[0] == 'low'
+    assert level_grid[Level.HIGH] == 'high'
+
+
+def test_enumgrid_pack_and_unpack():
+    grid = EnumGrid(Region, Tier, PayType)
+    keys = set()
+    for region in Region:
+        for tier in Tier:
+            for pay_type in PayType:
+                key = grid.pack(region, tier, pay_type)
+                assert grid.unpack(key) == (region, tier, pay_type)
+                keys.add(key)
+    assert keys == set(range(12))
+
+
+def test_enumgrid_one_dimension():
+    grid = EnumGrid(Region)
+    grid[Region.ASIA] = 'asia'
+    assert grid[Region.ASIA] == 'asia'
+    assert grid[Region.US] is None
+    grid.fill('all')
+    assert [value for _, value in grid.items()] == ['all'] * 3
+
+
+def test_enumgrid_fill():
+    grid = EnumGrid(Region, Tier, PayType, default=0)
+    grid.fill(1)
+    assert all(value == 1 for _, value in grid.items())
+
+    grid.fill(2, Region.EU, None, None)
+    grid.fill(3, None, Tier.PRO, PayType.WEEKEND)
+    grid.fill(4, EnumSet.of(Region.US, Region.ASIA), Tier.FREE, None)
+    for (region, tier, pay_type), value in grid.items():
+        if tier is Tier.PRO and pay_type is PayType.WEEKEND:
+            assert value == 3
+        elif region is Region.EU:
+            assert value == 2
+        elif tier is Tier.FREE:
+            assert value == 4
+        else:
+            assert value == 1
+
+
+def test_raise_enumgrid_is_not_enum_subtype():
+    with pytest.raises(TypeError) as excinfo:
+        EnumGrid(Region, int)
+
+    expected = "<class 'int'> is not Enum subclass"
+    assert str(excinfo.value) == expected
+
+
+def test_raise_enumgrid_pack_not_member_of_enum():
+    grid = EnumGrid(Region, Tier)
+    with pytest.raises(ValueError) as excinfo:
+        grid.pack(Region.US, PayType.WEEKDAY)
+
+    expected = "<PayType.WEEKDAY: 1> is not member of <enum 'Tier'>"
+    assert str(excinfo.value) == expected
+
+    with pytest.raises(ValueError) as excinfo:
+        grid[Region.US]
+
+    expected = "(<Region.US: 1>,) does not match "\
+               "(<enum 'Region'>, <enum 'Tier'>)"
+    assert str(excinfo.value) == expected
+
+    with pytest.raises(IndexError) as excinfo:
+        grid.unpack(6)
+
+    assert str(excinfo.value) == '6 is out of range'
+
+    class Level(IntEnum):
+        LOW = 1
+        HIGH = 2
+
+    class Priority(IntEnum):
+        LOW = 1
+
+    level_grid = EnumGrid(Level, Tier)
+    for const in [Priority.LOW, 2]:
+        with pytest.raises(ValueError) as excinfo:
+            level_grid.pack(const, Tier.FREE)
+
+        expected = "%r is not member of <enum 'Level'>" % const
+        assert str(excinfo.value) == expected
+
+
+def test_raise_enumgrid_fill_not_member_of_enum():
+    grid = EnumGrid(Region, Tier)
+    with pytest.raises(ValueError) as excinfo:
+        grid.fill(1, Tier.PRO, None)
+
+    expected = "<Tier.PRO: 2> is not member of <enum 'Region'>"
+    assert str(excinfo.value) == expected
+
+    with pytest.raises(ValueError) as excinfo:
+        grid.fill(1, None, [Tier.PRO, Region.US])
+
+    expected = "<Region.US: 1> is not member of <enum 'Tier'>"
+    assert str(excinfo.value) == expected
+
+    class Level(IntEnum):
+        LOW = 1
+        HIGH = 2
+
+    class Priority(IntEnum):
+        LOW = 1
+
+    level_grid = EnumGrid(Level, default=0)
+    for const in [Priority.LOW, 2]:
+        with pytest.raises(ValueError) as excinfo:
+            level_grid.fill(5, [const])
+
+        expected = "%r is not member of <enum 'Level'>" % const
+        assert str(excinfo.value) == expected
+    assert list(level_grid.items()) == [((Level.LOW,), 0), ((Level.HIGH,), 0)]
+
+
+@pytest.mark.parametrize('key', [-1, 6])
+def test_raise_enumgrid_key_is_out_of_range(key):
+    grid = EnumGrid(Region, Tier)
+    with pytest.raises(IndexError) as excinfo:
+        grid[key]
+    assert str(excinfo.value) == '%d is out of range' % key
+
+    with pytest.raises(IndexError) as excinfo:
+        grid[key] = 1
+    assert str(excinfo.value) == '%d is out of range' % key
@@ -1,7 +1,9 @@
+import gc
+import weakref
 from enum import Enum
 
 import pytest
-from extenum import EnumSet
+from extenum import EnumSet, FrozenEnumSet
 
 
 class Number(Enum):
@@ -185,3 +187,199 @@ def test_raise_is_not_enum_subtype():
 
     expected = "<class 'test_enumset.NonEnum'> is not Enum subclass"
     assert str(excinfo.value) == expected
+
+
+def test_enumset_diff():
+    enumset1 = EnumSet.of(Number.ONE, Number.THREE, Number.FIVE)
+    enumset2 = EnumSet.of(Number.ONE, Number.TWO, Number.FOUR)
+    added, removed = enumset1.diff(enumset2)
+    assert added == {Number.TWO, Number.FOUR}
+    assert removed == {Number.THREE, Number.FIVE}
+    assert added._enum_type is Number
+    assert removed._enum_type is Number
+
+    enumset1.apply_diff(added, removed)
+    assert enumset1 == enumset2
+
+
+def test_enumset_changes_since_checkpoint():
+    enumset = EnumSet.of(Number.ONE, Number.THREE)
+    enumset.checkpoint()
+    enumset.add(Number.TWO)
+    enumset.discard(Number.THREE)
+    enumset.add(Number.THREE)
+    enumset.remove(Number.ONE)
+    added, removed = enumset.changes()
+    assert added == {Number.TWO}
+    assert removed == {Number.ONE}
+
+    enumset.checkpoint()
+    added, removed = enumset.changes()
+    assert len(added) == 0
+    assert len(removed) == 0
+
+
+def test_raise_enumset_changes_without_checkpoint():
+    enumset = EnumSet.of(Number.ONE)
+    with pytest.raises(ValueError) as excinfo:
+        enumset.changes()
+
+    expected = 'EnumSet({<Number.ONE: 1>}) has no checkpoint'
+    assert str(excinfo.value) == expected
+
+
+def test_raise_enumset_diff_not_consistent_enum_type():
+    enumset = EnumSet.of(Number.ONE)
+    with pytest.raises(ValueError) as excinfo:
+        enumset.diff(EnumSet.of(YetAnotherNumber.ONE))
+
+    expected = "EnumSet({<YetAnotherNumber.ONE: 1>}) is not EnumSet of "\
+               "<enum 'Number'>"
+    assert str(excinfo.value) == expected
+
+
+def test_enumset_mask():
+    assert EnumSet.none_of(Number).mask() == 0
+    assert EnumSet.all_of(Number).mask() == 0b11111
+    assert EnumSet.of(Number.ONE, Number.THREE).mask() == 0b101
+
+
+def test_frozen_enumset():
+    enumset = FrozenEnumSet(Number, [Number.ONE, Number.THREE])
+    assert enumset == EnumSet.of(Number.ONE, Number.THREE)
+    assert enumset._enum_type is Number
+    assert enumset.mask() == 0b101
+    assert repr(FrozenEnumSet(Number)) == 'FrozenEnumSet()'
+    with pytest.raises(AttributeError):
+        enumset.add(Number.TWO)
+
+    other = FrozenEnumSet(Number, [Number.THREE, Number.FIVE])
+    for result, expected in [
+            (enumset | other, {Number.ONE, Number.THREE, Number.FIVE}),
+            (enumset & other, {Number.THREE}),
+            (enumset - other, {Number.ONE}),
+            (enumset ^ other, {Number.ONE, Number.FIVE}),
+            (enumset.union([Number.TWO]),
+             {Number.ONE, Number.TWO, Number.THREE}),
+            (enumset.intersection([Number.ONE]), {Number.ONE}),
+            (enumset.difference([Number.ONE]), {Number.THREE}),
+            (enumset.symmetric_difference([Number.ONE]), {Number.THREE})]:
+        assert isinstance(result, FrozenEnumSet)
+        assert result._enum_type is Number
+        assert result == expected
+
+    with pytest.raises(ValueError) as excinfo:
+        FrozenEnumSet(Number, [YetAnotherNumber.ONE])
+
+    expected = "<YetAnotherNumber.ONE: 1> is not member of <enum 'Number'>"
+    assert str(excinfo.value) == expected
+
+
+def test_enumset_mask_does_not_keep_enum_type_alive():
+    def create_enum_type():
+        Local = Enum('Local', 'A B C')
+        assert EnumSet.of(Local.B).mask() == 0b10
+        return weakref.ref(Local)
+
+    ref = create_enum_type()
+    gc.collect()
+    assert ref() is None
+
+
+def test_enumset_predicate():
+    predicate = EnumSet.predicate(
+        requires=(Number.ONE,),
+        forbids=EnumSet.of(Number.TWO),
+        any_of=(Number.FOUR, Number.FIVE))
+    assert predicate(EnumSet.of(Number.ONE, Number.FOUR))
+    assert predicate(EnumSet.of(Number.ONE, Number.THREE, Number.FIVE))
+    assert not predicate(EnumSet.of(Number.ONE, Number.TWO, Number.FOUR))
+    assert not predicate(EnumSet.of(Number.ONE, Number.THREE))
+    assert not predicate(EnumSet.of(Number.FOUR))
+
+    assert predicate(0b01001)
+    assert not predicate(0b01011)
+
+    targets = [EnumSet.of(Number.ONE, Number.FOUR), EnumSet.of(Number.TWO)]
+    assert predicate.evaluate_all(targets) == [True, False]
+
+
+def test_enumset_predicate_without_any_of():
+    predicate = EnumSet.predicate(forbids=(Number.TWO,))
+    assert predicate(EnumSet.none_of(Number))
+    assert predicate(EnumSet.of(Number.ONE))
+    assert not predicate(EnumSet.of(Number.TWO))
+
+
+def test_enumset_predicate_after_mutation():
+    predicate = EnumSet.predicate(requires=(Number.ONE,),
+                                  forbids=(Number.TWO,))
+    opts = EnumSet.none_of(Number)
+
+    def check(expected):
+        assert opts.mask() == sum(1 << (c.value - 1) for c in opts)
+        assert predicate(opts) is expected
+        assert predicate.evaluate_all([opts]) == [expected]
+
+    check(False)
+    opts.add(Number.ONE)
+    check(True)
+    opts.update([Number.TWO, Number.THREE])
+    check(False)
+    opts.discard(Number.TWO)
+    check(True)
+    opts.discard(Number.TWO)
+    check(True)
+    opts.remove(Number.ONE)
+    check(False)
+    opts |= EnumSet.of(Number.ONE, Number.TWO)
+    check(False)
+    opts -= EnumSet.of(Number.TWO)
+    check(True)
+    opts ^= EnumSet.of(Number.ONE, Number.FOUR)
+    check(False)
+    opts ^= EnumSet.of(Number.ONE)
+    check(True)
+    opts &= EnumSet.of(Number.TWO, Number.FOUR)
+    check(False)
+    opts.symmetric_difference_update([Number.ONE])
+    check(True)
+    opts.intersection_update([Number.ONE, Number.TWO])
+    check(True)
+    opts.difference_update([Number.ONE])
+    check(False)
+    opts.update([Number.ONE])
+    opts.pop()
+    check(False)
+    opts.update([Number.ONE, Number.FIVE])
+    check(True)
+    opts.clear()
+    check(False)
+    opts.apply_diff(EnumSet.of(Number.ONE), EnumSet.none_of(Number))
+    check(True)
+
+
+def test_raise_enumset_predicate_not_mask():
+    predicate = EnumSet.predicate(requires=(Number.ONE,))
+    with pytest.raises(ValueError) as excinfo:
+        predicate(True)
+
+    assert str(excinfo.value) == "True is not EnumSet of <enum 'Number'>"
+
+
+def test_raise_enumset_predicate_not_consistent_enum_type():
+    with pytest.raises(ValueError) as excinfo:
+        EnumSet.predicate(requires=(Number.ONE,),
+                          forbids=(YetAnotherNumber.TWO,))
+
+    expected = '(<Number.ONE: 1>, <YetAnotherNumber.TWO: 2>) '\
+               'are not consistent Enum type'
+    assert str(excinfo.value) == expected
+
+    predicate = EnumSet.predicate(requires=(Number.ONE,))
+    with pytest.raises(ValueError) as excinfo:
+        predicate(EnumSet.of(YetAnotherNumber.ONE))
+
+    expected = "EnumSet({<YetAnotherNumber.ONE: 1>}) is not EnumSet of "\
+               "<enum 'Number'>"
+    assert str(excinfo.value) == expected
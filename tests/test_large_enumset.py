@@ -0,0 +1,308 @@
+import random
+from enum import Enum
+
+import pytest
+from extenum import EnumSet, LargeEnumSet
+from extenum.large_enumset import ContainerType
+
+
+Code = Enum('Code', ['E%03d' % i for i in range(600)])
+
+
+class Number(Enum):
+    ONE = 1
+    TWO = 2
+    THREE = 3
+
+
+class SmallChunkEnumSet(LargeEnumSet):
+    _chunk_bits = 8  # 256 members per chunk
+
+
+def codes(*numbers):
+    return [Code['E%03d' % i] for i in numbers]
+
+
+def container_types(enumset):
+    return {key: container.type
+            for key, container in enumset._chunks.items()}
+
+
+def test_large_enumset_works_as_enumset():
+    enumset = LargeEnumSet.of(Number.ONE, Number.THREE)
+    assert len(enumset) == 2
+    assert enumset._enum_type is Number
+    assert Number.ONE in enumset
+    assert Number.TWO not in enumset
+    assert list(enumset) == [Number.ONE, Number.THREE]
+    assert enumset == EnumSet.of(Number.ONE, Number.THREE)
+    assert repr(enumset) == \
+        'LargeEnumSet({<Number.ONE: 1>, <Number.THREE: 3>})'
+
+    assert len(LargeEnumSet.none_of(Number)) == 0
+    assert repr(LargeEnumSet.none_of(Number)) == 'LargeEnumSet()'
+    assert list(LargeEnumSet.all_of(Number)) == list(Number)
+    assert list(LargeEnumSet.range(Number.TWO, Number.THREE)) == \
+        [Number.TWO, Number.THREE]
+
+    enumset.remove(Number.ONE)
+    assert list(enumset) == [Number.THREE]
+    with pytest.raises(KeyError):
+        enumset.remove(Number.ONE)
+    enumset.discard(Number.ONE)
+    assert enumset.pop() is Number.THREE
+    assert len(enumset) == 0
+
+
+def test_large_enumset_chooses_container():
+    enumset = SmallChunkEnumSet.of(*codes(1, 300))
+    assert container_types(enumset) == {
+        0: ContainerType.ARRAY, 1: ContainerType.ARRAY}
+
+    enumset.update(codes(*range(10, 40)))
+    assert container_types(enumset)[0] is ContainerType.RUN
+    assert len(enumset) == 32
+
+    enumset.update(codes(*range(41, 100, 2)))
+    assert container_types(enumset)[0] is ContainerType.BITMAP
+    assert len(enumset) == 62
+
+    for code in codes(*range(2, 256)):
+        enumset.discard(code)
+    assert container_types(enumset)[0] is ContainerType.ARRAY
+    assert list(enumset) == codes(1, 300)
+
+    enumset.discard(Code.E300)
+    assert container_types(enumset) == {0: ContainerType.ARRAY}
+
+
+def test_large_enumset_run_container():
+    numbers = set(range(10, 20)) | set(range(30, 40))
+    enumset = SmallChunkEnumSet.of(*codes(*numbers))
+    for number, add in [(20, True), (29, True), (25, True), (15, False),
+                        (25, False), (10, False), (39, False)]:
+        if add:
+            enumset.add(codes(number)[0])
+            numbers.add(number)
+        else:
+            enumset.discard(codes(number)[0])
+            numbers.discard(number)
+        assert container_types(enumset)[0] is ContainerType.RUN
+        assert list(enumset) == codes(*sorted(numbers))
+
+    for code in codes(*range(21, 29)):
+        enumset.add(code)
+    assert enumset._chunks[0].data.tolist() == [11, 14, 16, 38]
+    assert len(enumset) == 27
+
+
+def test_large_enumset_copy_on_write():
+    numbers = [1, 2, 3, *range(20, 60), *range(100, 200, 3), 300]
+    enumset = SmallChunkEnumSet.of(*codes(*numbers))
+    enumset.checkpoint()
+    for number in numbers:
+        copied = enumset.copy()
+        copied.discard(codes(number)[0])
+        copied.add(codes(number + 1)[0])
+        assert list(enumset) == codes(*numbers)
+
+    assert container_types(enumset) == {
+        0: ContainerType.BITMAP, 1: ContainerType.ARRAY}
+    enumset.add(Code.E301)
+    enumset.discard(Code.E020)
+    assert list(enumset._checkpoint) == codes(*numbers)
+    added, removed = enumset.changes()
+    assert list(added) == codes(301)
+    assert list(removed) == codes(20)
+
+    run = SmallChunkEnumSet.of(*codes(*range(10, 20)))
+    copied = run.copy()
+    copied.discard(Code.E015)
+    copied.add(Code.E020)
+    assert container_types(run)[0] is ContainerType.RUN
+    assert list(run) == codes(*range(10, 20))
+    assert list(copied) == codes(*range(10, 15), *range(16, 21))
+
+
+def test_large_enumset_add_and_discard():
+    random.seed(1)
+    enumset = SmallChunkEnumSet.of(*codes(*range(220, 290)))
+    expected = set(enumset)
+    types = set()
+    for _ in range(2000):
+        code = Code['E%03d' % random.randrange(200, 300)]
+        if random.random() < 0.5:
+            enumset.add(code)
+            expected.add(code)
+        else:
+            enumset.discard(code)
+            expected.discard(code)
+        assert len(enumset) == len(expected)
+        assert (code in enumset) == (code in expected)
+        types.update(container_types(enumset).values())
+    assert set(enumset) == expected
+    assert types == set(ContainerType)
+
+
+def test_large_enumset_set_algebra():
+    random.seed(1)
+    for _ in range(50):
+        numbers1 = random.sample(range(600), random.randrange(600))
+        numbers2 = random.sample(range(600), random.randrange(600))
+        numbers2.extend(range(300, 300 + random.randrange(300)))
+        set1, set2 = set(codes(*numbers1)), set(codes(*numbers2))
+        enumset1 = SmallChunkEnumSet.of(*set1) if set1 else \
+            SmallChunkEnumSet.none_of(Code)
+        enumset2 = SmallChunkEnumSet.none_of(Code)
+        for code in set2:
+            enumset2.add(code)
+
+        assert set(enumset1) == set1
+        assert set(enumset2) == set2
+        assert len(enumset2) == len(set2)
+        assert set(enumset1 & enumset2) == set1 & set2
+        assert set(enumset1 | enumset2) == set1 | set2
+        assert set(enumset1 - enumset2) == set1 - set2
+        assert set(enumset1 ^ enumset2) == set1 ^ set2
+        assert (enumset1 <= enumset2) == (set1 <= set2)
+        assert (enumset1 & enumset2) <= enumset2
+        assert (enumset1 == enumset2) == (set1 == set2)
+        assert all(code in enumset2 for code in set2)
+        assert list(enumset1) == sorted(set1, key=lambda c: c.value)
+
+        expected = 0
+        for code in set1:
+            expected |= 1 << (code.value - 1)
+        assert enumset1.mask() == expected
+
+
+def test_large_enumset_set_algebra_containers():
+    evens = LargeEnumSet.of(*codes(*range(0, 20, 2)))
+    odds = LargeEnumSet.of(*codes(*range(1, 20, 2)))
+    run = LargeEnumSet.of(*codes(*range(100, 300)))
+    assert container_types(evens) == {0: ContainerType.ARRAY}
+    assert container_types(run) == {0: ContainerType.RUN}
+
+    for enumset, numbers, type_ in [
+            (evens | odds, range(20), ContainerType.RUN),
+            (evens ^ LargeEnumSet.of(*codes(0, 1)),
+             [1, *range(2, 20, 2)], ContainerType.ARRAY),
+            (evens - odds, range(0, 20, 2), ContainerType.ARRAY),
+            (evens & LargeEnumSet.of(*codes(2, 3, 4)), [2, 4],
+             ContainerType.ARRAY),
+            (evens & run, [], None),
+            (run & LargeEnumSet.of(*codes(*range(150, 400))),
+             range(150, 300), ContainerType.RUN),
+            (run - LargeEnumSet.of(*codes(150)),
+             [*range(100, 150), *range(151, 300)], ContainerType.RUN),
+            (run ^ LargeEnumSet.of(*codes(*range(290, 310))),
+             [*range(100, 290), *range(300, 310)], ContainerType.RUN),
+            (evens | run, [*range(0, 20, 2), *range(100, 300)],
+             ContainerType.RUN)]:
+        assert list(enumset) == codes(*numbers)
+        expected = {} if type_ is None else {0: type_}
+        assert container_types(enumset) == expected
+
+    bitmap = SmallChunkEnumSet.of(*codes(*range(0, 100, 2), 300))
+    sparse = SmallChunkEnumSet.of(*codes(2, 3, 4, 301))
+    assert container_types(bitmap) == {
+        0: ContainerType.BITMAP, 1: ContainerType.ARRAY}
+    assert container_types(bitmap & sparse) == {
+        0: ContainerType.ARRAY}
+    assert container_types(bitmap | sparse) == {
+        0: ContainerType.BITMAP, 1: ContainerType.ARRAY}
+
+    # a chunk of one side only is shared until either of them changes it
+    union = bitmap | SmallChunkEnumSet.of(*codes(5))
+    union.add(Code.E301)
+    bitmap.discard(Code.E000)
+    assert list(union) == codes(*sorted([*range(0, 100, 2), 5, 300, 301]))
+    assert list(bitmap) == codes(*range(2, 100, 2), 300)
+
+
+def test_large_enumset_named_set_methods():
+    enumset = SmallChunkEnumSet.of(*codes(1, 2, 3, 300))
+    other = SmallChunkEnumSet.of(*codes(3, 4, 300, 400))
+    for others in [(other,), (set(other),), (list(other),)]:
+        assert set(enumset.union(*others)) == set(enumset) | set(other)
+        assert set(enumset.intersection(*others)) == \
+            set(enumset) & set(other)
+        assert set(enumset.difference(*others)) == set(enumset) - set(other)
+        assert set(enumset.symmetric_difference(*others)) == \
+            set(enumset) ^ set(other)
+        assert not enumset.issubset(*others)
+        assert not enumset.issuperset(*others)
+    assert list(enumset) == codes(1, 2, 3, 300)
+
+    assert list(enumset.union(codes(5), [Code.E006])) == \
+        codes(1, 2, 3, 5, 6, 300)
+    assert list(enumset.intersection(
+        codes(1, 2, 3), [Code.E001, Code.E003, Number.ONE])) == codes(1, 3)
+    assert list(enumset.difference(codes(1), (Code.E300, Number.ONE))) == \
+        codes(2, 3)
+    assert enumset.issubset(codes(*range(600)))
+    assert enumset.issuperset(codes(1, 300))
+    assert not enumset.issuperset([Number.ONE])
+    with pytest.raises(ValueError):
+        enumset.union([Number.ONE])
+
+    enumset.difference_update(codes(1), {Code.E002})
+    assert list(enumset) == codes(3, 300)
+    enumset.intersection_update(codes(3, 300, 400))
+    assert list(enumset) == codes(3, 300)
+    enumset.symmetric_difference_update(codes(3, 400))
+    assert list(enumset) == codes(300, 400)
+
+
+def test_large_enumset_inplace_set_algebra():
+    enumset = SmallChunkEnumSet.of(*codes(1, 2, 3, 300))
+    enumset |= SmallChunkEnumSet.of(*codes(4, 400))
+    assert list(enumset) == codes(1, 2, 3, 4, 300, 400)
+    enumset -= SmallChunkEnumSet.of(*codes(2, 300))
+    assert list(enumset) == codes(1, 3, 4, 400)
+    enumset &= SmallChunkEnumSet.of(*codes(1, 4, 400, 599))
+    assert list(enumset) == codes(1, 4, 400)
+    enumset ^= SmallChunkEnumSet.of(*codes(1, 5))
+    assert list(enumset) == codes(4, 5, 400)
+    enumset |= set(codes(6))
+    assert list(enumset) == codes(4, 5, 6, 400)
+
+
+def test_large_enumset_diff():
+    enumset1 = SmallChunkEnumSet.of(*codes(1, 3, 300))
+    enumset2 = SmallChunkEnumSet.of(*codes(1, 2, 400))
+    added, removed = enumset1.diff(enumset2)
+    assert list(added) == codes(2, 400)
+    assert list(removed) == codes(3, 300)
+
+    enumset1.checkpoint()
+    enumset1.apply_diff(added, removed)
+    assert enumset1 == enumset2
+    added, removed = enumset1.changes()
+    assert list(added) == codes(2, 400)
+    assert list(removed) == codes(3, 300)
+
+
+def test_large_enumset_predicate():
+    predicate = LargeEnumSet.predicate(requires=codes(1), forbids=codes(2))
+    assert predicate(LargeEnumSet.of(*codes(1, 599)))
+    assert not predicate(LargeEnumSet.of(*codes(1, 2)))
+
+
+def test_raise_large_enumset_add_not_member_of_enum():
+    enumset = LargeEnumSet.none_of(Number)
+    with pytest.raises(ValueError) as excinfo:
+        enumset.add(Code.E001)
+
+    expected = "<Code.E001: 2> is not member of <enum 'Number'>"
+    assert str(excinfo.value) == expected
+
+
+def test_raise_large_enumset_diff_not_consistent_enum_type():
+    enumset = LargeEnumSet.of(Number.ONE)
+    with pytest.raises(ValueError) as excinfo:
+        enumset.diff(EnumSet.of(Number.ONE))
+
+    expected = "EnumSet({<Number.ONE: 1>}) is not LargeEnumSet of "\
+               "<enum 'Number'>"
+    assert str(excinfo.value) == expected